@@ -1,54 +1,278 @@
-from fastapi import FastAPI, HTTPException
-from pydantic import BaseModel
-import pickle
+from contextlib import asynccontextmanager
+from typing import List
+import asyncio, os
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import ORJSONResponse
+from joblib import load
+import msgspec
 import numpy as np
+from sklearn.preprocessing import OrdinalEncoder
 from app.schema import CreditScoringInput
 
-# Initialize FastAPI app
-app = FastAPI()
+# onnxruntime is optional, without it the sklearn model is used for predictions
+try:
+    import onnxruntime as ort
+except ImportError:
+    ort = None
+
+# Paths of the model, encoder, and scaler
+model_path = 'model/model.joblib'
+scaler_path = 'model/scaler.joblib'
+encoder_path = 'model/encoder.joblib'
+onnx_model_path = 'model/model.onnx'
+
+# The features the api receives, in the order the model was trained on
+numerical_feature_names = ['RFMS_Score', 'RecencyScore']
+categorical_feature_names = ['PricingStrategy', 'ProductCategory']
+
+# Dynamic batching configuration, single predictions arriving within the timeout are predicted together
+max_batch_size = int(os.getenv('MAX_BATCH_SIZE', 32))
+batch_timeout_micros = int(os.getenv('BATCH_TIMEOUT_MICROS', 2000))
+
+async def batch_predictions(queue: asyncio.Queue, model):
+    """
+    A background task that collects queued single predictions into batches and predicts each batch with one call to the model.
+
+    Args:
+        queue(asyncio.Queue): the queue that holds tuples of a future and the preprocessed input of a request
+        model: the model used for the predictions
+    """
+    loop = asyncio.get_running_loop()
+
+    # the batches are gathered into one buffer that is reused, it is only allocated once the width of the inputs is known
+    buffer = None
+    while True:
+        # wait for the first request, then collect more until the batch is full or the timeout passes
+        batch = [await queue.get()]
+        deadline = loop.time() + batch_timeout_micros / 1_000_000
+        while len(batch) < max_batch_size:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(queue.get(), timeout=timeout))
+            except asyncio.TimeoutError:
+                break
+
+        # predict the whole batch at once, outside of the event loop
+        futures, rows = zip(*batch)
+        try:
+            if buffer is None:
+                buffer = np.empty((max_batch_size, rows[0].shape[1]), dtype=np.float32)
+            batch_data = np.concatenate(rows, axis=0, out=buffer[:len(rows)])
+            predictions = await asyncio.to_thread(model.predict, batch_data)
+        except Exception:
+            # an input that makes the model fail shouldn't fail the other requests of its batch, so the inputs are predicted one by one
+            await predict_separately(futures, rows, model)
+            continue
+
+        # hand every request its own prediction
+        for future, prediction in zip(futures, predictions):
+            if not future.done():
+                future.set_result(prediction)
+
+async def predict_separately(futures, rows, model):
+    """
+    Predicts the queued inputs of a failed batch one at a time, so only the requests whose own input fails get an error.
+
+    Args:
+        futures: the futures of the requests of the batch
+        rows: the preprocessed input of every request
+        model: the model used for the predictions
+    """
+    for future, row in zip(futures, rows):
+        if future.done():
+            continue
+        try:
+            prediction = (await asyncio.to_thread(model.predict, row))[0]
+        except Exception as e:
+            future.set_exception(e)
+        else:
+            future.set_result(prediction)
+
+class OnnxModel:
+    """
+    A wrapper around an onnxruntime session of the exported model, it predicts labels the same way the sklearn model does.
+    """
 
-# Load model, encoder, and scaler
-model_path = 'model/model.pkl'
-scaler_path = 'model/scaler.pkl'
-encoder_path = 'model/encoder.pkl'
+    def __init__(self, path: str):
+        """
+        Creates the inference session, limiting it to one thread so the workers of the server don't compete for the cpu.
 
+        Args:
+            path(str): the path of the onnx model
+        """
+        options = ort.SessionOptions()
+        options.intra_op_num_threads = 1
+        options.inter_op_num_threads = 1
+
+        self.session = ort.InferenceSession(path, sess_options=options, providers=['CPUExecutionProvider'])
+        self.input_name = self.session.get_inputs()[0].name
+        self.label_name = self.session.get_outputs()[0].name
+
+    def predict(self, data: np.ndarray) -> np.ndarray:
+        """
+        Predicts the labels of the given preprocessed inputs.
+
+        Args:
+            data(np.ndarray): the preprocessed inputs, one row per input
+
+        Returns:
+            np.ndarray: the predicted labels
+        """
+        return self.session.run([self.label_name], {self.input_name: np.asarray(data, dtype=np.float32)})[0]
+
+# Use the exported onnx model when it and onnxruntime are available, falling back to the sklearn model otherwise
+def load_predictor(model):
+    if ort is not None and os.path.exists(onnx_model_path):
+        return OnnxModel(onnx_model_path)
+    return model
+
+# Build a lookup from category to code for every categorical feature known by the encoder
+def build_category_maps(encoder):
+    return [{category: code for code, category in enumerate(categories)} for categories in encoder.categories_]
+
+# Load model, encoder, and scaler when the module is imported, so a server started with --preload loads them once and its forked workers share them.
+# Their arrays are memory mapped, the workers must only read from them and never change the state of the estimators
 try:
-    with open(model_path, 'rb') as model_file:
-        model = pickle.load(model_file)
+    model = load(model_path, mmap_mode='r')
+    scaler = load(scaler_path, mmap_mode='r')
+    encoder = load(encoder_path, mmap_mode='r')
+
+    # the inputs are encoded with one code per categorical feature, which only an ordinal encoder gives
+    if not isinstance(encoder, OrdinalEncoder):
+        raise TypeError(f"the encoder has to be an OrdinalEncoder, got {type(encoder).__name__}")
+
+    # the scaler and the encoder have to cover exactly the features the api receives, and together give the width the model expects
+    if scaler.n_features_in_ != len(numerical_feature_names):
+        raise ValueError(f"the scaler has to be fitted on {len(numerical_feature_names)} numerical features, got {scaler.n_features_in_}")
+    if hasattr(scaler, 'feature_names_in_') and list(scaler.feature_names_in_) != numerical_feature_names:
+        raise ValueError(f"the scaler has to be fitted on {numerical_feature_names}, got {list(scaler.feature_names_in_)}")
+    if len(encoder.categories_) != len(categorical_feature_names):
+        raise ValueError(f"the encoder has to be fitted on {len(categorical_feature_names)} categorical features, got {len(encoder.categories_)}")
 
-    with open(scaler_path, 'rb') as scaler_file:
-        scaler = pickle.load(scaler_file)
+    # cache the codes of every category and the statistics of the scaler so single inputs can be preprocessed without sklearn
+    category_maps = build_category_maps(encoder)
+    scaling = (scaler.mean_.astype(np.float32), (1.0 / scaler.scale_).astype(np.float32))
 
-    with open(encoder_path, 'rb') as encoder_file:
-        encoder = pickle.load(encoder_file)
+    n_features = scaling[0].size + len(category_maps)
+    if model.n_features_in_ != n_features:
+        raise ValueError(f"the model expects {model.n_features_in_} features, the scaler and the encoder give {n_features}")
 except Exception as e:
     raise RuntimeError(f"Error loading model, encoder, or scaler: {str(e)}")
 
+# Expose the loaded artifacts to the endpoints and start the batching task in every worker.
+# The onnx session is created here rather than at import time because sessions shouldn't be shared across forked workers
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    app.state.model = load_predictor(model)
+    app.state.scaler = scaler
+    app.state.encoder = encoder
+    app.state.category_maps = category_maps
+    app.state.scaling = scaling
+
+    # start the task that batches single predictions
+    app.state.queue = asyncio.Queue()
+    batcher = asyncio.create_task(batch_predictions(app.state.queue, app.state.model))
+
+    yield
+
+    batcher.cancel()
+
+# Initialize FastAPI app, responses are serialized with orjson
+app = FastAPI(lifespan=lifespan, default_response_class=ORJSONResponse)
+
+# Decoders that validate the raw request bodies straight into the input types
+input_decoder = msgspec.json.Decoder(CreditScoringInput)
+batch_input_decoder = msgspec.json.Decoder(List[CreditScoringInput])
+
+# Decode a request body, rejecting bodies that don't match the input type
+def decode_body(decoder, body: bytes):
+    try:
+        return decoder.decode(body)
+    except msgspec.DecodeError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
 # Preprocessing function
-def preprocess_input(data):
-    input_data = [
-        data.RFMS_Score,
-        data.RecencyScore,
-        data.PricingStrategy,
-        data.ProductCategory
-    ]
+def preprocess_input(data, scaling, category_maps):
+    mean, inverse_scale = scaling
+    processed_input = np.empty((1, mean.size + len(category_maps)), dtype=np.float32)
+
+    # standardize the numerical features with the cached statistics of the scaler
+    numerical_features = np.array([data.RFMS_Score, data.RecencyScore], dtype=np.float32)
+    processed_input[0, :mean.size] = (numerical_features - mean) * inverse_scale
+
+    # encode the categorical features by looking up their codes
+    categorical_features = [data.PricingStrategy, data.ProductCategory]
+    try:
+        processed_input[0, mean.size:] = [category_map[feature] for category_map, feature in zip(category_maps, categorical_features)]
+    except KeyError as e:
+        raise HTTPException(status_code=422, detail=f"Unknown category: {str(e)}")
+
+    # values too large for float32 become infinite, such inputs are rejected before they reach the model
+    if not np.isfinite(processed_input).all():
+        raise HTTPException(status_code=422, detail="The numerical features have to be finite float32 values")
+
+    return processed_input
+
+# Preprocessing function for many inputs, encodes them with the same cached statistics and category codes as single inputs
+def preprocess_batch(records, scaling, category_maps):
+    mean, inverse_scale = scaling
+    processed_input = np.empty((len(records), mean.size + len(category_maps)), dtype=np.float32)
+
+    # standardize the numerical features of all the inputs at once
+    numerical_features = np.asarray([(record.RFMS_Score, record.RecencyScore) for record in records], dtype=np.float32)
+    processed_input[:, :mean.size] = (numerical_features - mean) * inverse_scale
 
-    numerical_features = input_data[:2]
-    categorical_features = input_data[2:]
+    # encode the categorical features by looking up their codes, an unknown category is rejected the same way as for single inputs
+    try:
+        processed_input[:, mean.size:] = [[category_map[feature] for category_map, feature in zip(category_maps, (record.PricingStrategy, record.ProductCategory))] for record in records]
+    except KeyError as e:
+        raise HTTPException(status_code=422, detail=f"Unknown category: {str(e)}")
 
-    scaled_numerical = scaler.transform(np.array(numerical_features).reshape(1, -1))
-    encoded_categorical = encoder.transform([categorical_features])
+    # values too large for float32 become infinite, such inputs are rejected before they reach the model
+    if not np.isfinite(processed_input).all():
+        raise HTTPException(status_code=422, detail="The numerical features have to be finite float32 values")
 
-    processed_input = np.hstack([scaled_numerical, encoded_categorical])
     return processed_input
 
+# Predict the labels of many inputs at once
+def predict_batch(records, model, scaling, category_maps):
+    processed_data = preprocess_batch(records, scaling, category_maps)
+    predictions = model.predict(processed_data)
+    return np.where(predictions == 1, "Good", "Bad").tolist()
+
 # Prediction endpoint
 @app.post("/predict")
-def predict_credit_score(input_data: CreditScoringInput):
+async def predict_credit_score(request: Request):
+    input_data = decode_body(input_decoder, await request.body())
+    state = request.app.state
     try:
-        processed_data = preprocess_input(input_data)
-        prediction = model.predict(processed_data)
+        processed_data = preprocess_input(input_data, state.scaling, state.category_maps)
+
+        # queue the input to be predicted along with other requests and wait for its prediction
+        future = asyncio.get_running_loop().create_future()
+        await state.queue.put((future, processed_data))
+        prediction = await future
         label = "Good" if prediction == 1 else "Bad"
         return {"prediction": label}
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"Prediction error: {str(e)}")
+
+# Batch prediction endpoint
+@app.post("/predict/batch")
+async def predict_credit_scores(request: Request):
+    input_data = decode_body(batch_input_decoder, await request.body())
+    state = request.app.state
+    if not input_data:
+        return []
+
+    try:
+        labels = await asyncio.to_thread(predict_batch, input_data, state.model, state.scaling, state.category_maps)
+        return [{"prediction": label} for label in labels]
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Prediction error: {str(e)}")
@@ -1,6 +1,6 @@
-from pydantic import BaseModel
+import msgspec
 
-class CreditScoringInput(BaseModel):
+class CreditScoringInput(msgspec.Struct, frozen=True, forbid_unknown_fields=True):
     RFMS_Score: float
     RecencyScore: float
     PricingStrategy: str
@@ -1,4 +1,5 @@
 from typing import List
+import numpy as np
 import pandas as pd
 
 
@@ -18,33 +19,30 @@ class CreditScoreEngine:
         self.data = transaction_data
     
     @staticmethod
-    def calculate_recency(transaction_dates: pd.Series, latest_date: pd.Timestamp=None) -> int:
+    def calculate_recency(transaction_dates: pd.Series, latest_date: pd.Timestamp) -> int:
         """
         A function that calculates the recency of a users transaction.
 
         Args:
             transaction_dates(pd.Series): a series containing the dates of the user's transactions.
-            latest_date(pd.Timestamp): the time from which we want to calculate the recency value. Default is the time where the function is run.
+            latest_date(pd.Timestamp): the time from which we want to calculate the recency value, e.g pd.Timestamp.now(tz='UTC').
 
         Returns:
             int: an integer that represents the difference between the latest_date and the most recent date from the transaction date series. 
         """
-        
-        # If the latest date isn't passed, use today's date
-        if latest_date is None:
-            latest_date = pd.Timestamp.utcnow()
-
-        # Ensure the series is in datetime format
-        transaction_dates = pd.to_datetime(transaction_dates)
 
-        # Obtain the most recent transaction date from the series
-        user_latest = transaction_dates.max()
+        # only parse the series if it isn't already in datetime format, the numpy values of timezone aware dates are in UTC
+        if transaction_dates.dtype.kind != 'M':
+            transaction_dates = pd.to_datetime(transaction_dates)
+        dates = transaction_dates.to_numpy(dtype='datetime64[ns]') if isinstance(transaction_dates.dtype, pd.DatetimeTZDtype) else transaction_dates.to_numpy()
 
-        # Calculate the time delta
-        time_delta = latest_date - user_latest
+        # express the latest date in UTC as well
+        latest_date = pd.Timestamp(latest_date)
+        if latest_date.tzinfo is not None:
+            latest_date = latest_date.tz_convert(None)
 
-        # Return the number of days in the time delta
-        return time_delta.days
+        # Return the number of days between the latest date and the most recent transaction
+        return int((latest_date.to_datetime64() - dates.max()) // np.timedelta64(1, 'D'))
     
     def calcualte_rfms(self) -> pd.DataFrame:
         """
@@ -56,17 +54,19 @@ class CreditScoreEngine:
 
         # convert the date string to a pd.datetime object
         self.data['TransactionStartTime'] = pd.to_datetime(self.data['TransactionStartTime'])
+        latest_date = pd.Timestamp.now(tz='UTC')
         
         # first group the data for each data
-        user_groupings = self.data.groupby(by="CustomerId")
+        user_groupings = self.data.groupby(by="CustomerId", sort=False)
 
-        # now aggregate all the RFMS values
+        # now aggregate all the RFMS values, the recency is derived from the latest transaction of every user
         rfms_data = user_groupings.agg(
-            Recency=("TransactionStartTime", CreditScoreEngine.calculate_recency),
-            Frequency=("TransactionId", "count"),
+            LastTransaction=("TransactionStartTime", "max"),
+            Frequency=("TransactionId", "size"),
             Monetary=("Value", "sum"),
             Std_Deviation=("Value", "std")
         )
+        rfms_data.insert(loc=0, column='Recency', value=(latest_date - rfms_data.pop('LastTransaction')).dt.days.astype(np.int32))
 
         # now fill the NA values in standard deviation with zero
         rfms_data['Std_Deviation'] = rfms_data['Std_Deviation'].fillna(value=0)
@@ -95,23 +95,27 @@ class CreditScoreEngine:
             pd.DataFrame: A dataframe containing the final score obtained from RFMS scores and the individual RFMS scores
         """
 
-        # score the RFMS, 1 through 5
-        recency_score = pd.cut(x=rfms_data['Recency'], bins=5, labels=list(range(5, 0, -1)))
-        frequency_score = pd.cut(x=rfms_data['Frequency'], bins=5, labels=list(range(1, 6, 1)))
-        monetary_score = pd.cut(x=rfms_data['Monetary'], bins=5, labels=list(range(1, 6, 1)))
-        std_score = pd.cut(x=rfms_data['Std_Deviation'], bins=5, labels=list(range(5, 0, -1)))
+        # score the RFMS, 1 through 5, using the quantiles of each column as the bin edges. The scores are written straight into one int8 matrix
+        score_columns = {'RecencyScore': ('Recency', False), 'FrequencyScore': ('Frequency', True), 'MonetaryScore': ('Monetary', True), 'StdScore': ('Std_Deviation', False)}
+        score_matrix = np.empty(shape=(len(rfms_data), len(score_columns)), dtype=np.int8)
+        for idx, (column, ascending) in enumerate(score_columns.values()):
+            values = rfms_data[column].to_numpy()
+            edges = np.quantile(values, np.linspace(0, 1, 6))[1:-1]
+            score = score_matrix[:, idx]
+            score[:] = np.digitize(values, edges, right=False)
+
+            # turn the bin codes into scores, inverting them for the columns where lower values are better
+            if ascending:
+                score += 1
+            else:
+                np.subtract(5, score, out=score)
 
         # combine the scored RFMS using the provided weights
-        rfms_score = (recency_score.astype(int) * rfms_weights[0]) + (frequency_score.astype(int)) * rfms_weights[1] + (monetary_score.astype(int) * rfms_weights[2]) + (std_score.astype(int)) * rfms_weights[3]  
+        rfms_score = score_matrix.astype(np.float64) @ np.asarray(rfms_weights, dtype=np.float64)
 
         # create a dataframe to return the results
-        result = pd.DataFrame({
-            "RecencyScore": recency_score.astype(int),
-            "FrequencyScore": frequency_score.astype(int),
-            "MonetaryScore": monetary_score.astype(int),
-            "StdScore": std_score.astype(int),
-            "RFMS_Score": rfms_score
-        }).map(lambda x: float(x))
+        result = pd.DataFrame({score_name: score_matrix[:, idx] for idx, score_name in enumerate(score_columns)}, index=rfms_data.index)
+        result['RFMS_Score'] = rfms_score
 
         return result
 
@@ -128,13 +132,14 @@ class CreditScoreEngine:
             float: the value of the RFMS score used as a decision boundary.
         """
 
-        # label the scores
-        values = pd.qcut(x=data[score_column], q=[0, 0.55, 1], labels=['Bad', 'Good'])
+        # determine the boundary
+        scores = data[score_column].to_numpy()
+        boundary = float(np.quantile(scores, 0.55))
 
-        # add the score to the dataframe
-        data['RiskLabel'] = values
+        # label the scores, those at or below the boundary are 'Bad'
+        labels = np.where(scores <= boundary, 'Bad', 'Good')
 
-        # determine the boundary
-        boundary = data[score_column].quantile(q=0.55)
+        # add the labels to the dataframe
+        data['RiskLabel'] = pd.Categorical(labels, categories=['Bad', 'Good'])
 
         return data, boundary
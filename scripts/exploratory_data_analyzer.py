@@ -1,7 +1,9 @@
 import math, warnings
+import numpy as np
 import pandas as pd
 import seaborn as sns
 import matplotlib.pyplot as plt
+from scipy.stats import gaussian_kde
 
 warnings.simplefilter(action="ignore")
 
@@ -48,14 +50,18 @@ class EDAAnalyzer:
         # print out the result
         print(f"These are columns with missing values greater than 0%:\n{missing}")
 
-    def numerical_distribution(self) -> None:
+    def numerical_distribution(self, kde: bool = False) -> None:
         """
-        A function that will give histogram plots of numerical data with a density curve that shows the distribution of data
+        A function that will give histogram plots of numerical data, optionally with a density curve that shows the distribution of data
+
+        Args:
+            kde(bool): whether to overlay a density curve, it is estimated from a random sample of at most 10,000 values of each column. Default is False
         """
         
         # determine the numerical columns and data
-        numerical_data = self.data._get_numeric_data()
+        numerical_data = self.data.select_dtypes(include='number')
         numerical_cols = numerical_data.columns
+        numerical_values = numerical_data.to_numpy(dtype=np.float64)
 
         # detrmine number of rows and columns for 
         num_cols = math.ceil(len(numerical_cols) ** 0.5)
@@ -69,13 +75,11 @@ class EDAAnalyzer:
         # flatten the axes
         axes = axes.flatten()
 
+        rng = np.random.default_rng(seed=0)
         for idx, column in enumerate(numerical_cols):
-            # calculate the median and mean to use in the plots
-            median = self.data[column].median()
-            mean = self.data[column].mean()
-
-            # plot the histplot for that column with a density curve overlayed on it
-            sns.histplot(self.data[column], bins=15, kde=True, ax=axes[idx])
+            # obtain the values of the column without the missing ones
+            values = numerical_values[:, idx]
+            values = values[~np.isnan(values)]
 
             # add title for the subplot
             axes[idx].set_title(f"Distribution plot of {column}", fontsize=10)
@@ -84,6 +88,24 @@ class EDAAnalyzer:
             axes[idx].set_xlabel(column, fontsize=9)
             axes[idx].set_ylabel("Frequency", fontsize=9)
 
+            # a column without any values gets an empty plot
+            if values.size == 0:
+                continue
+
+            # calculate the median and mean to use in the plots
+            median = np.median(values)
+            mean = values.mean()
+
+            # plot the histogram for that column from precomputed bins
+            counts, edges = np.histogram(values, bins=15)
+            axes[idx].bar(edges[:-1], counts, width=np.diff(edges), align='edge')
+
+            # overlay the density curve estimated from a sample of the column, scaled to the histogram's counts
+            if kde and np.ptp(values) > 0:
+                sample = rng.choice(values, size=min(len(values), 10_000), replace=False)
+                x_values = np.linspace(edges[0], edges[-1], 200)
+                axes[idx].plot(x_values, gaussian_kde(sample)(x_values) * len(values) * np.diff(edges).mean())
+
             # add a lines for indicating the mean and median for the distribution
             axes[idx].axvline(mean, color='black', linewidth=1, label='Mean') # the line to indicate the mean
             axes[idx].axvline(median, color='red', linewidth=1, label='Median') # the line to indivate the median 
@@ -142,9 +164,8 @@ class EDAAnalyzer:
         axes = axes.flatten()
 
         for idx, column in enumerate(columns_of_interest):
-            # group the data around that column and count instances with respective values
-            column_grouping = self.data.groupby(by=column)
-            grouping_counts = column_grouping.size().sort_values()
+            # count instances with respective values of that column
+            grouping_counts = self.data[column].value_counts().sort_values()
 
             # create the bar plot
             sns_plot = sns.barplot(data=grouping_counts, ax=axes[idx], palette='husl')
@@ -153,13 +174,13 @@ class EDAAnalyzer:
             sns_plot.set_xlabel(xlabel=column, weight='bold', loc='center', labelpad=5)
 
             category_values = grouping_counts.keys()
-            for idx, patch in enumerate(sns_plot.patches):
+            for pidx, patch in enumerate(sns_plot.patches):
                 # get the corrdinates to write the values 
                 x_coordinate = patch.get_x() + patch.get_width() / 2
                 y_coordinate = patch.get_height()
 
                 # get the value to be written
-                value = grouping_counts[category_values[idx]]
+                value = grouping_counts[category_values[pidx]]
                 sns_plot.text(x=x_coordinate, y=y_coordinate, s=value, ha='center', va='bottom', weight='bold')
 
 
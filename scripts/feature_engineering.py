@@ -1,7 +1,40 @@
-from typing import List
+from dataclasses import dataclass
+from typing import Iterable, Iterator, List
+import warnings
 
+import numpy as np
 import pandas as pd
-from sklearn.preprocessing import LabelEncoder, StandardScaler
+from joblib import Parallel, delayed
+from sklearn.preprocessing import StandardScaler
+
+@dataclass
+class ColumnSchema:
+    """
+    The numerical and categorical columns of a dataframe, classified once from its dtypes so the steps of a pipeline don't have to scan the dtypes again.
+    The schema describes the data at the time it was obtained, obtain it again after a step changes the dtypes of the columns.
+    """
+    numeric: List[str]
+    categorical: List[str]
+
+    @staticmethod
+    def from_data(data: pd.DataFrame) -> 'ColumnSchema':
+        """
+        A function that classifies the columns of a dataframe by their dtypes.
+
+        Args:
+            data(pd.DataFrame): the dataframe whose columns are going to be classified
+
+        Returns:
+            ColumnSchema: the numerical columns, which exclude booleans, and the string or categorical columns of the data
+        """
+        numeric, categorical = [], []
+        for column, dtype in data.dtypes.items():
+            if isinstance(dtype, pd.CategoricalDtype) or pd.api.types.is_string_dtype(dtype):
+                categorical.append(column)
+            elif dtype.kind in 'iufc':
+                numeric.append(column)
+
+        return ColumnSchema(numeric=numeric, categorical=categorical)
 
 class FeatureEngineering:
     """
@@ -10,6 +43,9 @@ class FeatureEngineering:
     and all of the functions perform feature engineering on the passed data and return it without the need to keep the state in the instance.
     """
 
+    # the columns that hold ids formatted as <some_name>_<id_number>
+    id_columns = ['TransactionId', 'BatchId', 'AccountId', 'SubscriptionId', 'CustomerId', 'ProviderId', 'ProductId', 'ChannelId']
+
     @staticmethod
     def obtain_id(data: str):
         """
@@ -30,6 +66,55 @@ class FeatureEngineering:
     
         return id
 
+    @staticmethod
+    def extract_ids(ids: pd.Series, prefix: str) -> pd.Series:
+        """
+        A function that obtains the numbers of a whole column of ids formatted as <some_name>_<id_number>, it is the vectorized version of obtain_id.
+        When every id starts with the given prefix it is simply sliced off, otherwise the ids are split on their last '_'.
+        For categorical ids only the categories are parsed and every row then takes the id of its category.
+
+        Args:
+            ids(pd.Series): the ids from which the numbers are going to be extracted, a pd.Index also works
+            prefix(str): the prefix the ids are expected to share, e.g 'CustomerId_'
+
+        Returns:
+            pd.Series: the extracted ids as int32
+        """
+
+        if isinstance(ids.dtype, pd.CategoricalDtype):
+            # missing ids have the code -1, which would silently take the id of the last category, so they are rejected like the other ids
+            codes = ids.cat.codes.to_numpy()
+            if (codes < 0).any():
+                raise ValueError("cannot convert missing ids to integer")
+
+            category_ids = FeatureEngineering.extract_ids(ids.cat.categories, prefix=prefix).to_numpy()
+            return pd.Series(category_ids[codes], index=ids.index, name=ids.name)
+
+        if ids.str.startswith(prefix).all():
+            return ids.str.slice(start=len(prefix)).astype(np.int32)
+
+        return ids.str.rsplit('_', n=1).str.get(1).astype(np.int32)
+
+    @staticmethod
+    def convert_to_categorical(data: pd.DataFrame, ignore_columns: List[str] = ['TransactionStartTime']) -> pd.DataFrame:
+        """
+        A function that converts the string columns of a dataframe to the category dtype. Every distinct value is then stored only once and the rows hold small integer codes,
+        this shrinks the memory used by the data and lets encode_categorical_data use the codes directly. It is intended to be run right after loading the data.
+
+        Args:
+            data(pd.DataFrame): the dataframe whose string columns are going to be converted
+            ignore_columns(List[str]): the columns that should be left as they are, default is the TransactionStartTime column
+
+        Returns:
+            pd.DataFrame: the dataframe with its string columns stored as categories
+        """
+
+        for column in data.select_dtypes(include=['object']).columns:
+            if column in ignore_columns: continue
+            data[column] = data[column].astype('category')
+
+        return data
+
     @staticmethod
     def extract_date_features(data: pd.DataFrame, date_column : str = 'TransactionStartTime') -> pd.DataFrame:
         """
@@ -43,45 +128,153 @@ class FeatureEngineering:
             pd.DataFrame: the resulting data frame with the new date features
         """
 
-        # convert the date data to a datetime object
-        data['TransactionStartTime'] = pd.to_datetime(data['TransactionStartTime'])
+        # convert the date data to a datetime object, the ISO 8601 dates of the dataset go straight to the vectorized ISO parser and other formats are inferred
+        if data[date_column].dtype.kind != 'M':
+            try:
+                data[date_column] = pd.to_datetime(data[date_column], format='ISO8601', cache=True)
+            except ValueError:
+                data[date_column] = pd.to_datetime(data[date_column], cache=True)
+
+        # obtain the dates as numpy datetimes in their local time, the numpy values of dates in UTC already are
+        dates = data[date_column]
+        if dates.dt.tz is not None and str(dates.dt.tz) != 'UTC':
+            dates = dates.dt.tz_localize(None)
+        dates = dates.to_numpy(dtype='datetime64[s]')
 
-        # break down the data
-        data['Hour'] = data['TransactionStartTime'].dt.hour
-        data['Day'] = data['TransactionStartTime'].dt.day
-        data['Month'] = data['TransactionStartTime'].dt.month
-        data['Year'] = data['TransactionStartTime'].dt.year
+        # break down the data by truncating the dates to each unit, storing the features in the smallest integer types that fit them
+        years = dates.astype('datetime64[Y]')
+        months = dates.astype('datetime64[M]')
+        days = dates.astype('datetime64[D]')
+        features = {
+            'Hour': (dates.astype('datetime64[h]') - days).astype(np.int8),
+            'Day': (days - months).astype(np.int8) + 1,
+            'Month': (months - years).astype(np.int8) + 1,
+            'Year': years.astype(np.int16) + 1970
+        }
+
+        # missing dates would come out as the epoch, so when there are any the features are stored as nullable integers that are missing for them
+        missing = np.isnat(dates)
+        for feature, values in features.items():
+            data[feature] = pd.arrays.IntegerArray(values, missing) if missing.any() else values
 
         return data
     
     @staticmethod
-    def encode_categorical_data(data: pd.DataFrame) -> tuple[pd.DataFrame, dict]:
+    def encode_id_columns(data: pd.DataFrame, n_jobs: int = -1) -> pd.DataFrame:
+        """
+        A function that replaces every id column with the numbers of its ids, the same way obtain_id does but over the whole column at once.
+
+        Args:
+            data(pd.DataFrame): the dataframe whose id columns are going to be encoded
+            n_jobs(int): the number of threads the columns are parsed with, -1 uses all the cores. Default is -1
+
+        Returns:
+            pd.DataFrame: the dataframe with its id columns holding int32 ids
+        """
+        id_columns = FeatureEngineering.id_columns
+
+        # the columns are independent of each other so they are parsed in parallel
+        ids = Parallel(n_jobs=n_jobs, prefer='threads')(delayed(FeatureEngineering.extract_ids)(data[column], prefix=f'{column}_') for column in id_columns)
+
+        # write every column back as its numpy buffer, which skips aligning the parsed ids on the index
+        for column, column_ids in zip(id_columns, ids):
+            data[column] = column_ids.to_numpy(dtype=np.int32)
+
+        return data
+
+    @staticmethod
+    def obtain_code_type(n_categories: int) -> type:
+        """
+        A function that gives the narrowest integer type that can hold the codes of the given number of categories.
+
+        Args:
+            n_categories(int): the number of categories
+
+        Returns:
+            type: one of np.int8, np.int16 or np.int32
+        """
+        if n_categories <= np.iinfo(np.int8).max:
+            return np.int8
+        if n_categories <= np.iinfo(np.int16).max:
+            return np.int16
+        return np.int32
+
+    @staticmethod
+    def encode_column(values: pd.Series) -> tuple[pd.Series, dict]:
+        """
+        A function that label encodes a single column with the codes of its categories, new categories are sorted so the codes match sklearn's LabelEncoder.
+
+        Args:
+            values(pd.Series): the column that is going to be encoded
+
+        Returns:
+            tuple: the codes of the column in the narrowest integer type that fits them and the mapping from category to code
+        """
+        # a categorical column already holds its codes, only the other columns have to be converted
+        categorical = values if isinstance(values.dtype, pd.CategoricalDtype) else values.astype('category')
+        categories = categorical.cat.categories
+
+        # store the codes in the narrowest integer type that fits the number of categories
+        code_type = FeatureEngineering.obtain_code_type(len(categories))
+        codes = categorical.cat.codes.astype(code_type)
+
+        return codes, {category: code for code, category in enumerate(categories)}
+
+    @staticmethod
+    def encode_categorical_data(data: pd.DataFrame, n_jobs: int = -1, schema: ColumnSchema = None) -> tuple[pd.DataFrame, dict]:
         """
         A function that encodes the categorical data of a given dataframe.
 
         Args:
             data(pd.DataFrame): the dataframe whose categorical data are going to be encoded
+            n_jobs(int): the number of threads the columns are encoded with, -1 uses all the cores. Default is -1
+            schema(ColumnSchema): the already classified columns of the data, when it is not given the columns are classified from the dtypes of the data
         
         Returns:
-            tuple: the dataframe with its categorical data encoded and a dict containing encoders
+            tuple: the dataframe with its categorical data encoded and a dict containing a mapping from category to code for every encoded column
         """
-        # apply the obtain_id function on id columns
-        id_columns = ['TransactionId', 'BatchId', 'AccountId', 'SubscriptionId', 'CustomerId', 'ProviderId', 'ProductId', 'ChannelId']
-        data[id_columns] = data[id_columns].map(FeatureEngineering.obtain_id)
+        # obtain the number of every id column
+        data = FeatureEngineering.encode_id_columns(data, n_jobs=n_jobs)
 
-        # now use sklearn's label encoder for the remaining categorical data
-        remaining_categorical_cols = data.select_dtypes(include=['object', 'category']).columns
+        # now label encode the remaining categorical data
+        if schema is None:
+            schema = ColumnSchema.from_data(data)
+        # columns that are numeric by now, e.g because they were encoded after the schema was obtained, are skipped
+        remaining_categorical_cols = [column for column in schema.categorical if column not in FeatureEngineering.id_columns and data[column].dtype.kind not in 'biufc']
 
-        # go throught the columns and train and use the LabelEncoder for each of them
+        # encode the columns in parallel, then put the codes back into the data
+        results = Parallel(n_jobs=n_jobs, prefer='threads')(delayed(FeatureEngineering.encode_column)(data[column]) for column in remaining_categorical_cols)
         encoders = {}
-        encoder = LabelEncoder()
-        for column in remaining_categorical_cols:
-            col_encoder = encoder.fit(data[column])
-            data[column] = col_encoder.transform(data[column])
-            encoders[column] = encoder
+        for column, (codes, mapping) in zip(remaining_categorical_cols, results):
+            data[column] = codes.to_numpy()
+            encoders[column] = mapping
 
         return data, encoders
 
+    @staticmethod
+    def transform_categorical_data(data: pd.DataFrame, encoders: dict, n_jobs: int = -1) -> pd.DataFrame:
+        """
+        A function that encodes the categorical data of new data with the mappings obtained from encode_categorical_data.
+
+        Args:
+            data(pd.DataFrame): the dataframe whose categorical data are going to be encoded
+            encoders(dict): the mapping from category to code for every encoded column, as returned by encode_categorical_data
+            n_jobs(int): the number of threads the id columns are parsed with, -1 uses all the cores. Default is -1
+
+        Returns:
+            pd.DataFrame: the dataframe with its categorical data encoded, categories that weren't seen when encoding get the code -1
+        """
+        # obtain the number of every id column
+        data = FeatureEngineering.encode_id_columns(data, n_jobs=n_jobs)
+
+        # look up the code of every value in the mapping of its column
+        for column, mapping in encoders.items():
+            code_type = FeatureEngineering.obtain_code_type(len(mapping))
+            codes = data[column].map(mapping).astype(np.float64).fillna(-1)
+            data[column] = codes.astype(code_type)
+
+        return data
+
     @staticmethod
     def handle_missing_data(data: pd.DataFrame) -> pd.DataFrame:
         """
@@ -94,13 +287,22 @@ class FeatureEngineering:
             pd.DataFrame: the dataframe without NA values
         """
 
-        return data.dropna()
+        # find the rows that have no NA values, the data is returned as is when no row has to be removed
+        complete_rows = data.notna().all(axis=1).to_numpy()
+        if complete_rows.all():
+            return data
+
+        return data.iloc[complete_rows]
     
     @staticmethod
     def aggregate_customer_data(data: pd.DataFrame) -> pd.DataFrame:
         """
         A function that aggregates a customers data from a transaction dataset and then adds the new data to the original data.
 
+        **Note: Make sure to handle missing data before running this, the CustomerId and Amount columns are expected to have no NA values**
+
+        The aggregates are written as new contiguous columns rather than joined, so normalize_numerical_features can scan every numerical column with unit stride.
+
         Args:
             data(pd.DataFrame): the data from which the customer data is going to be aggregated
 
@@ -108,22 +310,43 @@ class FeatureEngineering:
             pd.DataFrame: a dataframe which contains the original data and the aggregated data
         """
 
-        # group and aggregate the data
-        customer_grouping = data.groupby(by="CustomerId")
-        customer_aggregation = customer_grouping.agg(
-            TotalTransaction = ('Amount', 'sum'),
-            AverageTransaction = ('Amount', 'mean'),
-            TransactionCount = ('TransactionId', 'count'),
-            StdTransaction = ('Amount', 'std')
-        )
+        # obtain the position of the customer of every row, a categorical CustomerId already holds them as its codes and the others are factorized without sorting.
+        # customers without transactions only get empty groups, the aggregates are only ever read through the codes of the rows
+        customer_ids = data['CustomerId']
+        if isinstance(customer_ids.dtype, pd.CategoricalDtype):
+            codes, n_customers = customer_ids.cat.codes.to_numpy(), len(customer_ids.cat.categories)
+        else:
+            codes, customers = pd.factorize(customer_ids, sort=False)
+            n_customers = len(customers)
+        amounts = data['Amount'].to_numpy(dtype=np.float64)
+
+        # shift the amounts of every customer by one of their own amounts, so the sums of squares below don't lose precision to large amounts
+        shift = np.zeros(n_customers)
+        shift[codes] = amounts
+        shifted_amounts = amounts - shift[codes]
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            # aggregate the count, sum and sum of squares of every customer, none of them depends on another so the amounts are only swept once for each
+            transaction_count = np.bincount(codes, minlength=n_customers)
+            shifted_total = np.bincount(codes, weights=shifted_amounts, minlength=n_customers)
+            shifted_squares = np.bincount(codes, weights=shifted_amounts * shifted_amounts, minlength=n_customers)
 
-        # join the newly aggregated data with the previous data over the customerId
-        data = data.join(other=customer_aggregation, how='left', on='CustomerId')
+            # derive the total and the average, then the sample standard deviation, customers with a single transaction get NA like they do with pandas
+            total_transaction = shifted_total + transaction_count * shift
+            average_transaction = total_transaction / transaction_count
+            variance = (shifted_squares - shifted_total * shifted_total / transaction_count) / (transaction_count - 1)
+            std_transaction = np.sqrt(np.maximum(variance, 0.0))
+
+        # broadcast the aggregates back to the rows of each customer, each one is stored as its own contiguous column
+        data['TotalTransaction'] = total_transaction[codes]
+        data['AverageTransaction'] = average_transaction[codes]
+        data['TransactionCount'] = transaction_count[codes]
+        data['StdTransaction'] = std_transaction[codes]
 
         return data
 
     @staticmethod
-    def normalize_numerical_features(data: pd.DataFrame) -> tuple[pd.DataFrame, StandardScaler]:
+    def normalize_numerical_features(data: pd.DataFrame, columns_to_ignore: List[str] = [], schema: ColumnSchema = None) -> tuple[pd.DataFrame, StandardScaler]:
         """
         A function that normalizes numerical data.
 
@@ -131,18 +354,187 @@ class FeatureEngineering:
 
         Args:
             data(pd.DataFrame): the data whose numerical values are to be normalized
+            columns_to_ignore(List[str]): numerical columns that shouldn't be normalized, e.g the compact Hour, Day, Month and Year features when they are used as categories. 
+                                          Normalizing them turns them into float32 columns.
+            schema(ColumnSchema): the already classified columns of the data, when it is not given the columns are classified from the dtypes of the data
         
         Returns:
-            pd.DataFrame: the dataframe with normalized numerical columns
+            pd.DataFrame: the dataframe with normalized numerical columns, they are stored as float32
+            StandardScaler: a scaler holding the statistics of the numerical columns, it can be used to transform new data
         """
 
         # obtain the numerical columns
-        numerical_columns = list(data._get_numeric_data().columns)
+        if schema is None:
+            schema = ColumnSchema.from_data(data)
+        numerical_columns = [column for column in schema.numeric if column not in columns_to_ignore]
 
-        scaler = StandardScaler()
-        scaler = scaler.fit(data[numerical_columns])
+        # take the numerical columns as one writable column major float32 block, so every column is a contiguous run of values that is normalized in place
+        values = np.require(data[numerical_columns].to_numpy(dtype=np.float32), requirements=['F', 'W'])
 
-        # normalized data
-        data[numerical_columns] = scaler.transform(data[numerical_columns])
+        # compute the statistics with float64 accumulators and store them on a scaler so new data can be transformed the same way,
+        # missing values are ignored like the StandardScaler does and stay missing after normalizing
+        n_samples = np.count_nonzero(~np.isnan(values), axis=0)
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', category=RuntimeWarning)
+            mean = np.nanmean(values, axis=0, dtype=np.float64)
+            variance = np.nanvar(values, axis=0, dtype=np.float64)
+        scaler = FeatureEngineering.build_scaler(mean, variance, n_samples, numerical_columns)
+
+        # normalized data, the float64 statistics are applied before rounding back to float32 so columns with a large offset keep their precision
+        np.subtract(values, scaler.mean_, out=values)
+        np.divide(values, scaler.scale_, out=values)
+        data[numerical_columns] = values
 
         return data, scaler
+
+    @staticmethod
+    def build_scaler(mean: np.ndarray, variance: np.ndarray, n_samples: np.ndarray, columns: List[str]) -> StandardScaler:
+        """
+        A function that builds a fitted StandardScaler from already computed statistics, columns with no variance are left unscaled like the StandardScaler does.
+
+        Args:
+            mean(np.ndarray): the mean of every column
+            variance(np.ndarray): the population variance of every column
+            n_samples(np.ndarray): the number of values every column's statistics were computed from, missing values aren't counted
+            columns(List[str]): the names of the columns
+
+        Returns:
+            StandardScaler: a scaler that can transform data with the given statistics
+        """
+        scale = np.sqrt(variance)
+        scale[scale == 0] = 1.0
+
+        scaler = StandardScaler()
+        scaler.mean_ = mean
+        scaler.var_ = variance
+        scaler.scale_ = scale
+        # like the StandardScaler, the number of samples is a single number unless the columns have different amounts of missing values
+        n_samples = np.atleast_1d(np.asarray(n_samples, dtype=np.int64))
+        unique_samples = np.unique(n_samples)
+        scaler.n_samples_seen_ = unique_samples[0] if len(unique_samples) == 1 else n_samples
+        scaler.n_features_in_ = len(columns)
+        scaler.feature_names_in_ = np.asarray(columns, dtype=object)
+
+        return scaler
+
+    @staticmethod
+    def select_scaler_columns(scaler: StandardScaler, columns: List[str]) -> StandardScaler:
+        """
+        A function that builds a scaler holding the statistics of only some of the columns of a fitted scaler, e.g the numerical features a model is served with.
+
+        Args:
+            scaler(StandardScaler): the scaler returned by normalize_numerical_features or fit_streaming
+            columns(List[str]): the columns to keep, in the order the new scaler expects them
+
+        Returns:
+            StandardScaler: a scaler that transforms the given columns exactly like the original scaler does
+        """
+        fitted_columns = list(scaler.feature_names_in_)
+        missing_columns = [column for column in columns if column not in fitted_columns]
+        if missing_columns:
+            raise ValueError(f"The scaler wasn't fitted on the columns {missing_columns}")
+
+        # take the statistics of the columns in the requested order
+        idx = [fitted_columns.index(column) for column in columns]
+        n_samples = np.broadcast_to(scaler.n_samples_seen_, scaler.mean_.shape)[idx]
+
+        return FeatureEngineering.build_scaler(scaler.mean_[idx], scaler.var_[idx], n_samples, columns)
+
+    @staticmethod
+    def transform_numerical_features(data: pd.DataFrame, scaler: StandardScaler) -> pd.DataFrame:
+        """
+        A function that normalizes the numerical data of new data with the statistics of an already fitted scaler, without fitting it again.
+
+        Args:
+            data(pd.DataFrame): the data whose numerical values are to be normalized, it has to contain the columns the scaler was fitted on
+            scaler(StandardScaler): the scaler returned by normalize_numerical_features
+
+        Returns:
+            pd.DataFrame: the dataframe with normalized numerical columns, they are stored as float32
+        """
+
+        # obtain the columns the scaler was fitted on
+        numerical_columns = list(scaler.feature_names_in_)
+
+        # take the numerical columns as one writable column major float32 block and normalize it in place with the stored statistics
+        values = np.require(data[numerical_columns].to_numpy(dtype=np.float32), requirements=['F', 'W'])
+        np.subtract(values, scaler.mean_, out=values)
+        np.divide(values, scaler.scale_, out=values)
+        data[numerical_columns] = values
+
+        return data
+
+    @staticmethod
+    def fit_streaming(data_iter: Iterable[pd.DataFrame], columns_to_ignore: List[str] = []) -> tuple[StandardScaler, dict]:
+        """
+        A function that obtains the statistics of normalize_numerical_features and the mappings of encode_categorical_data from data that comes in chunks,
+        e.g from pd.read_csv(..., chunksize=...). Only one chunk is held in memory at a time.
+
+        **Note: The chunks should already have their missing data handled and their customer data aggregated, the aggregates can't be computed chunk by chunk**
+
+        Args:
+            data_iter(Iterable[pd.DataFrame]): the chunks of the data
+            columns_to_ignore(List[str]): numerical columns that shouldn't be normalized
+
+        Returns:
+            StandardScaler: a scaler holding the statistics of the numerical columns
+            dict: a mapping from category to code for every categorical column, other than the id columns
+        """
+        schema = None
+        for chunk in data_iter:
+            # classify the columns from the first chunk
+            if schema is None:
+                schema = ColumnSchema.from_data(chunk)
+                numerical_columns = [column for column in schema.numeric if column not in columns_to_ignore]
+                categorical_columns = [column for column in schema.categorical if column not in FeatureEngineering.id_columns]
+                n_samples = np.zeros(len(numerical_columns), dtype=np.int64)
+                mean, squared_deviations = np.zeros(len(numerical_columns)), np.zeros(len(numerical_columns))
+                categories = {column: set() for column in categorical_columns}
+
+            # the statistics of the chunk, every column only counts its values that aren't missing like the StandardScaler does
+            values = chunk[numerical_columns].to_numpy(dtype=np.float64)
+            chunk_samples = np.count_nonzero(~np.isnan(values), axis=0)
+            chunk_mean = np.divide(np.nansum(values, axis=0), chunk_samples, out=np.zeros(len(numerical_columns)), where=chunk_samples > 0)
+            chunk_squared_deviations = np.nansum((values - chunk_mean) ** 2, axis=0)
+
+            # combine the mean and the sum of squared deviations of the chunk with the ones of the previous chunks, column by column
+            total = n_samples + chunk_samples
+            delta = chunk_mean - mean
+            weight = np.divide(chunk_samples, total, out=np.zeros(len(numerical_columns)), where=total > 0)
+            mean = mean + delta * weight
+            squared_deviations = squared_deviations + chunk_squared_deviations + delta ** 2 * n_samples * weight
+            n_samples = total
+
+            # collect the categories seen in the chunk
+            for column in categorical_columns:
+                categories[column].update(chunk[column].dropna().unique())
+
+        if schema is None:
+            raise ValueError("There are no chunks to fit on")
+
+        # columns without any values get missing statistics, the same as in normalize_numerical_features
+        mean[n_samples == 0] = np.nan
+        variance = np.divide(squared_deviations, n_samples, out=np.full(len(numerical_columns), np.nan), where=n_samples > 0)
+        scaler = FeatureEngineering.build_scaler(mean, variance, n_samples, numerical_columns)
+
+        # the categories are sorted so the codes match the ones of encode_categorical_data
+        encoders = {column: {category: code for code, category in enumerate(sorted(values))} for column, values in categories.items()}
+
+        return scaler, encoders
+
+    @staticmethod
+    def transform_streaming(data_iter: Iterable[pd.DataFrame], scaler: StandardScaler, encoders: dict) -> Iterator[pd.DataFrame]:
+        """
+        A function that normalizes and encodes data that comes in chunks with the results of fit_streaming, yielding every chunk once it is transformed.
+
+        Args:
+            data_iter(Iterable[pd.DataFrame]): the chunks of the data
+            scaler(StandardScaler): the scaler returned by fit_streaming
+            encoders(dict): the mappings returned by fit_streaming
+
+        Returns:
+            Iterator[pd.DataFrame]: the normalized and encoded chunks
+        """
+        for chunk in data_iter:
+            chunk = FeatureEngineering.transform_numerical_features(chunk, scaler)
+            yield FeatureEngineering.transform_categorical_data(chunk, encoders)
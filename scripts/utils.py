@@ -1,7 +1,9 @@
 import math
-import seaborn as sns
+import warnings
+import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
+from scipy.stats import gaussian_kde
 
 def visualize_numerical_distribution(data: pd.DataFrame) -> None:
     """
@@ -15,8 +17,15 @@ def visualize_numerical_distribution(data: pd.DataFrame) -> None:
     """
 
     # determine the numerical columns and data
-    numerical_data = data._get_numeric_data()
+    numerical_data = data.select_dtypes(include='number')
     numerical_cols = numerical_data.columns
+    numerical_values = numerical_data.to_numpy(dtype=np.float64)
+
+    # calculate the medians and means of all the columns at once to use in the plots, columns without values get NaN
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', category=RuntimeWarning)
+        medians = np.nanmedian(numerical_values, axis=0)
+        means = np.nanmean(numerical_values, axis=0)
 
     # detrmine number of rows and columns for 
     num_cols = math.ceil(len(numerical_cols) ** 0.5)
@@ -30,13 +39,14 @@ def visualize_numerical_distribution(data: pd.DataFrame) -> None:
     # flatten the axes
     axes = axes.flatten()
 
+    rng = np.random.default_rng(seed=0)
     for idx, column in enumerate(numerical_cols):
-        # calculate the median and mean to use in the plots
-        median = data[column].median()
-        mean = data[column].mean()
+        median = medians[idx]
+        mean = means[idx]
 
-        # plot the histplot for that column with a density curve overlayed on it
-        sns.histplot(data[column], bins=15, kde=True, ax=axes[idx])
+        # obtain the values of the column without the missing ones
+        values = numerical_values[:, idx]
+        values = values[~np.isnan(values)]
 
         # add title for the subplot
         axes[idx].set_title(f"Distribution plot of {column}", fontsize=10)
@@ -45,6 +55,20 @@ def visualize_numerical_distribution(data: pd.DataFrame) -> None:
         axes[idx].set_xlabel(column, fontsize=9)
         axes[idx].set_ylabel("Frequency", fontsize=9)
 
+        # a column without any values gets an empty plot
+        if values.size == 0:
+            continue
+
+        # plot the histogram for that column from precomputed bins
+        counts, edges = np.histogram(values, bins=15)
+        axes[idx].bar(edges[:-1], counts, width=np.diff(edges), align='edge')
+
+        # overlay the density curve estimated from a sample of at most 10,000 values of the column, scaled to the histogram's counts
+        if np.ptp(values) > 0:
+            sample = rng.choice(values, size=min(len(values), 10_000), replace=False)
+            x_values = np.linspace(edges[0], edges[-1], 200)
+            axes[idx].plot(x_values, gaussian_kde(sample)(x_values) * len(values) * np.diff(edges).mean())
+
         # add a lines for indicating the mean and median for the distribution
         axes[idx].axvline(mean, color='black', linewidth=1, label=f'Mean = {round(mean , 2)}') # the line to indicate the mean
         axes[idx].axvline(median, color='red', linewidth=1, label=f'Median = {round(median, 2)}') # the line to indivate the median 
@@ -82,10 +106,7 @@ def plot_bar_chart_with_values(counts, title='Count of Risk Labels', xlabel='Ris
     bars = counts.plot(kind='bar', color=bar_colors, alpha=0.7)
 
     # Add the value on top of each bar
-    for bar in bars.patches:
-        yval = bar.get_height()  # Get the height of each bar
-        plt.text(bar.get_x() + bar.get_width() / 2, yval, int(yval), 
-                 ha='center', va='bottom', fontsize=12)  # Add text at the center-top of the bar
+    bars.bar_label(bars.containers[0], fmt='%d', fontsize=12)
 
     plt.title(title, weight='bold')
     plt.xlabel(xlabel, weight='bold')
@@ -114,9 +135,7 @@ def plot_iv_bar_chart(iv_values: dict):
     bars = ax.bar(columns, iv_scores, color='skyblue')
 
     # Add IV scores on top of each bar
-    for bar, iv in zip(bars, iv_scores):
-        height = bar.get_height()
-        ax.text(bar.get_x() + bar.get_width() / 2, height, f'{iv:.4f}', ha='center', va='bottom', fontsize=10, fontweight='bold')
+    ax.bar_label(bars, labels=[f'{iv:.4f}' for iv in iv_scores], fontsize=10, fontweight='bold')
 
     # Set labels and title
     ax.set_xlabel('Columns', fontsize=12)
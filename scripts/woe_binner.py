@@ -1,12 +1,14 @@
+from collections import OrderedDict
 from typing import List
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 import warnings
 
-warnings.simplefilter(action="ignore")
-
 class WOE_Binner:
+    # the number of obtain_counts results that are cached
+    max_cached_counts = 4
+
     def __init__(self, data: pd.DataFrame, target: str):
         """
         Initialize a WOE Binner
@@ -17,37 +19,113 @@ class WOE_Binner:
         """
         self.data = data
         self.target = target
-        self.numerical_columns = self.obtain_numerical_cols()
-        self.categorical_columns = self.obtain_categorical_cols()
+        self.numerical_columns, self.categorical_columns = self.classify_columns()
+
+        # the target is factorized once, every count looks up the good rows through its codes, rows without a target get -1.
+        # the data and target the codes belong to are kept so the codes are redone when the binner is given other data
+        self._target_codes, self._target_levels, self._target_source = None, None, None
+
+        # counts that were already obtained, keyed by the data, the target and the bins they were counted for, from the least to the most recently used
+        self._counts_cache: OrderedDict = OrderedDict()
+
+    def invalidate_cache(self):
+        """
+        A function that drops the cached counts and the codes of the target, it has to be called after the data of the binner is changed in place
+        """
+        self._target_source = None
+        self._counts_cache.clear()
+
+    def _target_masks(self, good_label: any) -> tuple[np.ndarray, np.ndarray]:
+        """
+        A function that finds the good rows and the rows that have a target from the codes of the target
+
+        Args:
+            good_label(any): a value that indicates what the good value is in the target column, every other value is bad
+
+        Returns:
+            tuple: a bool for every row that tells whether it is good and a bool for every row that tells whether it has a target
+        """
+        # factorize the target when it wasn't factorized yet for the current data and target
+        # the data itself is kept rather than its id, so a new dataframe can't be mistaken for a freed one that had the same id
+        source = self._target_source
+        if source is None or source[0] is not self.data or source[1:] != (self.data.shape, self.target):
+            self._target_codes, self._target_levels = pd.factorize(self.data[self.target], sort=False)
+            self._target_source = (self.data, self.data.shape, self.target)
+
+        # a good label that doesn't occur in the target leaves every row bad
+        good_idx = self._target_levels.get_indexer([good_label])[0]
+
+        return self._target_codes == good_idx, self._target_codes >= 0
+
+    def classify_columns(self) -> tuple[List[str], List[str]]:
+        """
+        A function that splits the columns of the classes dataframe into numerical and categorical columns in a single pass over their dtypes, won't include the target column
+
+        Returns:
+            tuple: the list of the numerical columns and the list of the categorical columns
+        """
+        numerical_columns, categorical_columns = [], []
+        for column, dtype in self.data.dtypes.items():
+            if column == self.target: continue
+
+            # bool columns count as numerical, string and category columns count as categorical
+            if pd.api.types.is_numeric_dtype(dtype):
+                numerical_columns.append(column)
+            elif dtype == object or dtype == 'str' or isinstance(dtype, pd.CategoricalDtype):
+                categorical_columns.append(column)
+
+        return numerical_columns, categorical_columns
 
     def obtain_numerical_cols(self) -> List[str]:
         """
         A function that returns the numerical columns from the classes dataframe, won't include the target column
         """
-        numerical_columns = self.data._get_numeric_data().columns
-        numerical_columns = [column for column in numerical_columns if column != self.target]
-
-        return numerical_columns
+        return self.classify_columns()[0]
 
     def obtain_categorical_cols(self) -> List[str]:
         """
         A function that returns the categorical columns from the classes dataframe, won't include the target column
         """
-        categorical_columns = self.data.select_dtypes(include=['object', 'category']).columns.tolist()
-        if self.target in categorical_columns:
-            categorical_columns.remove(self.target)
-
-        return categorical_columns
+        return self.classify_columns()[1]
 
     def bin_numerical_cols(self, columns_to_ignore: List[str] = [], n_bins: int = 5) -> dict:
         """
-        A function that will bin numeric data into a given amount of bins/groups
+        A function that will bin numeric data into a given amount of bins/groups, the bins are quantile based and the same as the ones of pd.qcut with duplicate edges dropped
+
+        Args:
+            columns_to_ignore(List[str]): numerical columns that shouldn't be binned
+            n_bins(int): the number of bins for every column, columns with repeated values can get less bins. Default is 5
+
+        Returns:
+            dict: a dict that contains column names as keys and categorical series of the bin of every row as values
         """
+        columns = [column for column in self.numerical_columns if column not in columns_to_ignore]
+
+        # compute the quantile edges of all the columns at once
+        values = self.data[columns].to_numpy(dtype=np.float64)
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', category=RuntimeWarning)
+            edges = np.nanquantile(values, np.linspace(0, 1, n_bins + 1), axis=0)
+
         bins = {}
-        for column in self.numerical_columns:
-            if column in columns_to_ignore: continue
-            col_bins = pd.qcut(x=self.data[column], q=5, duplicates='drop')
-            bins[column] = col_bins
+        for idx, column in enumerate(columns):
+            # drop the repeated edges, columns without values get no edges
+            col_edges = np.unique(edges[:, idx])
+            col_edges = col_edges[~np.isnan(col_edges)]
+            col_values = values[:, idx]
+
+            # find the bin of every value, the bins are closed on the right and the lowest value is included in the first one
+            positions = np.searchsorted(col_edges, col_values, side='left')
+            if len(col_edges) > 0:
+                positions[col_values == col_edges[0]] = 1
+            # the codes are stored in int8 unless there are too many bins for it
+            code_type = np.int8 if len(col_edges) <= np.iinfo(np.int8).max else np.int32
+            codes = (positions - 1).astype(code_type)
+            codes[(positions == 0) | (positions == len(col_edges))] = -1
+
+            # label the bins with intervals the same way pd.qcut does
+            labels = pd.cut(col_edges, bins=col_edges, include_lowest=True).categories if len(col_edges) > 1 else pd.IntervalIndex([])
+            bins[column] = pd.Series(pd.Categorical.from_codes(codes, categories=labels, ordered=True), index=self.data.index, name=column)
 
         return bins
 
@@ -55,129 +133,311 @@ class WOE_Binner:
         """
         A function that will bin categorical data into given amount of bins/groups
         """
-        # Ensure 'bin' is not part of the data being processed
-        if 'bin' in self.data.columns:
-            self.data = self.data.drop(columns=['bin'])
-        
         bins = {}
         for column in self.categorical_columns:
-            # check if the number of unique values is greater than 10
-            n_unique = self.data[column].nunique()
+            if column in ignore_cols: continue
 
-            # if it greater than 10 skip it
-            if n_unique > 10 or column in ignore_cols: continue
-            
-            # get the unique values for the column
-            col_bins = self.data[column].unique().tolist()
+            # count the values of the column in a single pass, the values that occur give both the number of unique values and the bins.
+            # missing values don't get a bin, their rows aren't counted the same as the missing values of numerical columns
+            value_counts = self.data[column].value_counts(sort=False)
+            value_counts = value_counts[value_counts > 0]
 
-            bins[column] = col_bins
+            # check if the number of unique values is greater than 10 and skip it if it is
+            if len(value_counts) > 10: continue
+
+            # keep the unique values for the column as an index, obtain_counts looks the rows up in it without rebuilding it from a list
+            bins[column] = value_counts.index
         
         return bins
 
+    def _obtain_bin_codes(self, column: str, binning, numeric: bool) -> tuple[np.ndarray, pd.Index]:
+        """
+        A function that gives the position of the bin of every row of a column, rows without a bin get -1
+
+        Args:
+            column(str): the name of the column
+            binning: the bins of the column, a categorical series for numeric columns or an index or a list of the values for non numeric columns
+            numeric(bool): a bool that determines whether the bins passed are for a numeric or a non numeric column
+
+        Returns:
+            tuple: the bin codes of the rows and the labels of the bins
+        """
+        if numeric:
+            # the bins are categorical, so their codes give the position of the bin of every row
+            return binning.cat.codes.to_numpy(), binning.cat.categories
+
+        # look up the position of the value of every row in the bins, bins given as a list are turned into an index first
+        bin_labels = binning if isinstance(binning, pd.Index) else pd.Index(binning)
+        values = self.data[column]
+        bin_codes = bin_labels.get_indexer(values)
+
+        # rows with missing values don't belong to a bin, even when the bins were given with a missing value
+        bin_codes[values.isna().to_numpy()] = -1
+
+        return bin_codes, bin_labels
+
+    @staticmethod
+    def _count_matrix(bin_codes: np.ndarray, good: np.ndarray, n_bins: int) -> np.ndarray:
+        """
+        A function that counts the bad and good rows of every bin with a single bincount over the combined codes
+
+        Args:
+            bin_codes(np.ndarray): the position of the bin of every row, all of them have to be valid positions
+            good(np.ndarray): a bool for every row that tells whether it is good, the others are bad
+            n_bins(int): the number of bins
+
+        Returns:
+            np.ndarray: an int32 array of shape (n_bins, 2), the first column holds the bad counts and the second the good counts
+        """
+        return np.bincount(bin_codes.astype(np.intp) * 2 + good, minlength=n_bins * 2).reshape(n_bins, 2).astype(np.int32)
+
     def obtain_counts(self, bins: dict, good_label: any, numeric: bool = True) -> dict:
         """
         A function that will count the good and bad values for every cut
 
         Args:
             bins(dict): a dictionary that contains keys that are column names and values that contain the bins
-            good_label(any): a value that indicates what the good value is in the target column
+            good_label(any): a value that indicates what the good value is in the target column, every other value is bad
             numeric(bool): a bool that determines whether the bins passed are for numeric or non numeric columns
         
         Returns:
-            dict: a dict that contains columns where the keys are column names and the value are dictionaries containing values for good and bad counts
+            dict: a dict that contains column names as keys and arrays of shape (n_bins, 2) as values, the rows follow the order of the bins and hold the bad and good counts
+        """
+        # the data and the bins are identified by their objects, a cached entry keeps them alive so their ids aren't reused by others
+        key = (id(self.data), self.data.shape, self.target, good_label, numeric, tuple((column, id(binning)) for column, binning in bins.items()))
+        if key in self._counts_cache:
+            self._counts_cache.move_to_end(key)
+        else:
+            self._counts_cache[key] = (self.data, bins, self._count_bins(bins, good_label, numeric))
+
+            # only the most recently used counts are kept, so re-binning again and again doesn't pile up the codes of old bins
+            while len(self._counts_cache) > self.max_cached_counts:
+                self._counts_cache.popitem(last=False)
+
+        # hand out copies so changing the returned counts doesn't change the cached ones
+        return {column: count_matrix.copy() for column, count_matrix in self._counts_cache[key][2].items()}
+
+    def _count_bins(self, bins: dict, good_label: any, numeric: bool) -> dict:
+        """
+        A function that counts the good and bad values for every cut without looking at the cache, takes the same arguments as obtain_counts
+
+        Args:
+            bins(dict): a dictionary that contains keys that are column names and values that contain the bins
+            good_label(any): a value that indicates what the good value is in the target column, every other value is bad
+            numeric(bool): a bool that determines whether the bins passed are for numeric or non numeric columns
+
+        Returns:
+            dict: the counts of the bins, the same as obtain_counts
         """
         counts = {}
-        if numeric:
-            for column, binnig in bins.items():
-                self.data['bin'] = binnig
 
-                # group the bins and count occurences of each target value
-                grouped_data = self.data.groupby('bin')[self.target].value_counts().unstack(fill_value=0)
+        # find the good rows once, rows without a target aren't counted
+        good, has_target = self._target_masks(good_label)
 
-                # Store the counts in the dictionary
-                counts[column] = grouped_data.to_dict(orient='index')
+        if numeric and bins:
+            # the codes of all the numeric columns are counted together with a single bincount
+            return self._count_numeric_columns(bins, good, has_target)
 
-            # Drop the temporary 'bin' column
-            self.data = self.data.drop(columns=['bin'])
-        else:
-            for column, binnig in bins.items():
-                # group the bins and count occurences of each target value
-                grouped_data = self.data.groupby(column)[self.target].value_counts().unstack(fill_value=0)
+        for column, binnig in bins.items():
+            bin_codes, bin_labels = self._obtain_bin_codes(column, binnig, numeric)
+
+            # count the bad and good rows of every bin, rows without a bin aren't counted
+            counted = (bin_codes >= 0) & has_target
+            counts[column] = self._count_matrix(bin_codes[counted], good[counted], len(bin_labels))
 
-                # Store the counts in the dictionary
-                counts[column] = grouped_data.to_dict(orient='index')
         return counts
 
+    def _count_numeric_columns(self, bins: dict, good: np.ndarray, has_target: np.ndarray) -> dict:
+        """
+        A function that counts the bad and good rows of the bins of all the numeric columns with one bincount over the codes of every column
+
+        Args:
+            bins(dict): a dictionary that contains keys that are column names and values that contain the categorical series of the bins
+            good(np.ndarray): a bool for every row that tells whether it is good, the others are bad
+            has_target(np.ndarray): a bool for every row that tells whether it has a target
+
+        Returns:
+            dict: a dict that contains column names as keys and arrays of shape (n_bins, 2) as values, the same as obtain_counts
+        """
+        columns = list(bins)
+        n_bins = [len(bins[column].cat.categories) for column in columns]
+        max_bins = max(max(n_bins), 1)
+
+        # stack the bin codes of the columns, one column of codes for every binned column
+        codes = np.column_stack([bins[column].cat.codes.to_numpy() for column in columns]).astype(np.intp)
+
+        # give every column, bin and target its own slot, rows without a bin or a target go to an extra slot at the end
+        keys = np.arange(len(columns)) * max_bins * 2 + codes * 2 + good[:, None]
+        dump = len(columns) * max_bins * 2
+        keys[(codes < 0) | ~has_target[:, None]] = dump
+
+        # count every slot at once and split the counts into the tables of the columns
+        tables = np.bincount(keys.ravel(), minlength=dump + 1)[:dump].reshape(len(columns), max_bins, 2).astype(np.int32)
+
+        return {column: tables[idx, :n_bins[idx]] for idx, column in enumerate(columns)}
+
+    @staticmethod
+    def _woe(good_counts: np.ndarray, bad_counts: np.ndarray, total_good: int, total_bad: int) -> np.ndarray:
+        """
+        A function that calculates the WOE of every bin from its good and bad counts with a single log call
+
+        Args:
+            good_counts(np.ndarray): the number of good rows in every bin
+            bad_counts(np.ndarray): the number of bad rows in every bin
+            total_good(int): the number of good rows across all the bins
+            total_bad(int): the number of bad rows across all the bins
+
+        Returns:
+            np.ndarray: the WOE of every bin
+        """
+        # the ratio of the good and the bad percentages is taken before the log, the small constant avoids division by zero and log(0)
+        return np.log(((good_counts + 0.5) * (total_bad + 0.5)) / ((bad_counts + 0.5) * (total_good + 0.5)))
+
+    @staticmethod
+    def _bad_prob(count_matrix: np.ndarray) -> np.ndarray:
+        """
+        A function that calculates the bad probability of every bin from the totals of the rows of its counts
+
+        Args:
+            count_matrix(np.ndarray): the bad and good counts of the bins of a column, as returned by obtain_counts
+
+        Returns:
+            np.ndarray: the bad probability of every bin, bins without values get a bad probability of 0
+        """
+        total_counts = count_matrix.sum(axis=1)
+        return np.divide(count_matrix[:, 0], total_counts, out=np.zeros(len(total_counts)), where=total_counts > 0)
+
+    @staticmethod
+    def _iv(count_matrix: np.ndarray, woe: np.ndarray) -> float:
+        """
+        A function that calculates the IV of a column from the percentages of good and bad in every bin
+
+        Args:
+            count_matrix(np.ndarray): the bad and good counts of the bins of the column, as returned by obtain_counts
+            woe(np.ndarray): the WOE of every bin
+
+        Returns:
+            float: the IV of the column
+        """
+        total_bad, total_good = count_matrix.sum(axis=0)
+        good_perc = count_matrix[:, 1] / total_good if total_good > 0 else np.zeros(len(count_matrix))
+        bad_perc = count_matrix[:, 0] / total_bad if total_bad > 0 else np.zeros(len(count_matrix))
+
+        return float(((good_perc - bad_perc) * woe).sum())
+
+    @staticmethod
+    def _compute_stats(counts: dict, woe_values: dict = None) -> tuple[dict, dict, dict]:
+        """
+        A function that calculates the WOE, the bad probability and the IV of every column in a single sweep over the counts of its bins.
+
+        Args:
+            counts(dict): a dict containing names of columns and arrays of the bad and good counts of their bins, as returned by obtain_counts
+            woe_values(dict): WOE values to calculate the IV with instead of the ones calculated from the counts
+
+        Returns:
+            tuple: three dicts, arrays of the WOE and of the bad probability of the bins of every column, and the IV of every column
+        """
+        woe_dict, bad_prob_dict, iv_values = {}, {}, {}
+
+        for column, count_matrix in counts.items():
+            bad_counts, good_counts = count_matrix[:, 0], count_matrix[:, 1]
+
+            # Calculate total bad and good across all bins
+            total_bad, total_good = count_matrix.sum(axis=0)
+
+            # Calculate the WOE and the bad probability of all the bins at once
+            woe = WOE_Binner._woe(good_counts, bad_counts, total_good, total_bad)
+            bad_prob = WOE_Binner._bad_prob(count_matrix)
+
+            woe_dict[column] = woe
+            bad_prob_dict[column] = bad_prob
+            iv_values[column] = WOE_Binner._iv(count_matrix, woe if woe_values is None else woe_values[column])
+
+        return woe_dict, bad_prob_dict, iv_values
+
     def calculate_woe(self, counts: dict) -> dict:
         """
         A function that calculates the WOE for a given counts dictionary.
     
         Args:
-            counts (dict): a dict containing names of columns, within another dictionary
-                           that contains keys as bins and values as dicts containing counts.
+            counts (dict): a dict containing names of columns and arrays of the bad and good counts of their bins, as returned by obtain_counts
         
         Returns:
-            dict: a dict that contains keys as columns and then values as dicts that
-                  themselves contain floats for the WOE value.
+            dict: a dict that contains keys as columns and then values as arrays of the WOE of their bins
         """
-        woe_dict = {}
-    
-        # Calculate total good and bad across all bins
-        for column, bins in counts.items():
-            total_good = sum(bins[bin].get('Good', 0) for bin in bins)  # Total good counts
-            total_bad = sum(bins[bin].get('Bad', 0) for bin in bins)    # Total bad counts
-    
-            # Store the WOE for each bin
-            woe_dict[column] = {}
-    
-            for bin, bin_counts in bins.items():
-                good_count = bin_counts.get('Good', 0)
-                bad_count = bin_counts.get('Bad', 0)
-    
-                # Avoid division by zero by adding a small constant
-                good_ratio = (good_count + 0.5) / (total_good + 0.5)
-                bad_ratio = (bad_count + 0.5) / (total_bad + 0.5)
-    
-                # Calculate WOE
-                if good_ratio > 0 and bad_ratio > 0:  # Avoid log(0)
-                    woe = np.log(good_ratio / bad_ratio)
-                else:
-                    woe = 0
-    
-                woe_dict[column][bin] = woe
-    
-        return woe_dict
+        return self._compute_stats(counts)[0]
     
     def bad_probability(self, counts:dict) -> dict:
         """
         A function that calculates the bad probability given counts dictionary of bins
 
         Args:
-            counts(dict): a dict containing names of columns and within another dictionary that contains keys as bins and values as dicts containing counts
+            counts(dict): a dict containing names of columns and arrays of the bad and good counts of their bins, as returned by obtain_counts
 
         Returns:
-            dict: a dict that contains key as columns and then values as dicts that they themselves contain floats for the bad probabilities            
+            dict: a dict that contains key as columns and then values as arrays of the bad probabilities of their bins
         """
-        bad_prob_dict = {}
+        return {column: self._bad_prob(count_matrix) for column, count_matrix in counts.items()}
 
-        # Iterate over each column in the counts dictionary
-        for column, bins in counts.items():
-            bad_prob_dict[column] = {}
-    
-            # Calculate bad probability for each bin
-            for bin, bin_counts in bins.items():
-                bad_count = bin_counts.get('Bad')  # Count of bad (0) values in the current bin
-                total_count = sum(bin_counts.values())  # Total count of good + bad values in the bin
-    
-                # Avoid division by zero
-                if total_count > 0:
-                    bad_prob = bad_count / total_count
-                else:
-                    bad_prob = 0  # If no values in the bin, bad probability is 0
-    
-                bad_prob_dict[column][bin] = bad_prob
-    
-        return bad_prob_dict
+    @staticmethod
+    def _woe_iv_kernel(bin_codes: np.ndarray, good: np.ndarray, n_bins: int) -> tuple[np.ndarray, float]:
+        """
+        A function that counts the good and bad rows of every bin with a single bincount and calculates only their WOE and the IV from the counts.
+
+        Args:
+            bin_codes(np.ndarray): the position of the bin of every row, all of them have to be valid positions
+            good(np.ndarray): a bool for every row that tells whether it is good, the others are bad
+            n_bins(int): the number of bins
+
+        Returns:
+            tuple: the WOE of every bin and the IV of the column
+        """
+        count_matrix = WOE_Binner._count_matrix(bin_codes, good, n_bins)
+        total_bad, total_good = count_matrix.sum(axis=0)
+
+        # the WOE and the IV with the same helpers as calculate_woe and calculate_iv_from_bins, the bad probabilities aren't needed
+        woe = WOE_Binner._woe(count_matrix[:, 1], count_matrix[:, 0], total_good, total_bad)
+
+        return woe, WOE_Binner._iv(count_matrix, woe)
+
+    def _fast_woe_iv(self, column: str, binning, good_label: any, numeric: bool) -> tuple[np.ndarray, float]:
+        """
+        A function that calculates the WOE of the bins of a column and its IV straight from the codes of the rows
+
+        Args:
+            column(str): the name of the column
+            binning: the bins of the column, a categorical series for numeric columns or a list of the values for non numeric columns
+            good_label(any): a value that indicates what the good value is in the target column, every other value is bad
+            numeric(bool): a bool that determines whether the bins passed are for a numeric or a non numeric column
+
+        Returns:
+            tuple: the WOE of every bin and the IV of the column
+        """
+        bin_codes, bin_labels = self._obtain_bin_codes(column, binning, numeric)
+
+        # only the rows that have a bin and a target are counted
+        good, has_target = self._target_masks(good_label)
+        counted = (bin_codes >= 0) & has_target
+
+        return self._woe_iv_kernel(bin_codes[counted], good[counted], len(bin_labels))
+
+    def calculate_woe_iv(self, bins: dict, good_label: any, numeric: bool = True) -> tuple[dict, dict]:
+        """
+        A function that calculates the WOE and the IV of the given bins without obtaining their counts first, it is the faster choice for columns with many bins
+
+        Args:
+            bins(dict): a dictionary that contains keys that are column names and values that contain the bins
+            good_label(any): a value that indicates what the good value is in the target column, every other value is bad
+            numeric(bool): a bool that determines whether the bins passed are for numeric or non numeric columns
+
+        Returns:
+            tuple: a dict that contains the WOE of the bins of every column, the same as calculate_woe, and a dict with the IV of every column
+        """
+        woe_dict, iv_values = {}, {}
+        for column, binning in bins.items():
+            woe_dict[column], iv_values[column] = self._fast_woe_iv(column, binning, good_label, numeric)
+
+        return woe_dict, iv_values
     
     @staticmethod
     def get_plotting_data(bins_dict: dict, counts: dict, bad_probs: dict, woe_dict: dict, column: str, numeric: bool):
@@ -186,37 +446,28 @@ class WOE_Binner:
 
             Args:
                 bins_dict (dict): Dictionary containing bin information for the specified column.
-                counts (dict): Dictionary containing counts of good and bad loans for each bin.
-                bad_probs (dict): Dictionary containing bad probability values for each bin.
-                woe_dict (dict): Dictionary containing Weight of Evidence (WoE) values for each bin.
+                counts (dict): Dictionary containing the arrays of bad and good counts of the bins.
+                bad_probs (dict): Dictionary containing the arrays of bad probability values of the bins.
+                woe_dict (dict): Dictionary containing the arrays of Weight of Evidence (WoE) values of the bins.
                 column (str): The column name for which the data is retrieved.
                 numeric (bool): Indicates if the column contains numeric or categorical values.
 
             Returns:
                 DataFrame: A pandas DataFrame containing bins, good counts, bad counts, bad probability, and WoE values for the specified column.
         """
+        # the arrays follow the order of the bins, the categories of the numeric bins are already the unique intervals in order
         if numeric == True:
-            bins = bins_dict[column].unique()
+            bins = bins_dict[column].cat.categories
         else:
             bins = bins_dict[column]
 
-        good_counts = []
-        bad_counts = []
-        bad_propability = []
-        woe = []
-
-        for bin in bins:
-            good_counts.append(counts[column][bin]['Good'])
-            bad_counts.append(counts[column][bin]['Bad'])
-            bad_propability.append(bad_probs[column][bin])
-            woe.append(woe_dict[column][bin])
-
+        count_matrix = counts[column]
         ploting_data = pd.DataFrame({
             'bins': bins,
-            'good_count': good_counts,
-            'bad_count': bad_counts,
-            'bad_probability': bad_propability,
-            'woe': woe
+            'good_count': count_matrix[:, 1],
+            'bad_count': count_matrix[:, 0],
+            'bad_probability': bad_probs[column],
+            'woe': woe_dict[column]
         })
 
         return ploting_data
@@ -345,40 +596,12 @@ class WOE_Binner:
         Calculate Information Value (IV) for multiple columns based on their bins, good/bad counts, and WoE values.
 
         Args:
-            counts (dict): Dictionary of good/bad counts for each bin of each column. 
-                           Structure: {column: {bin: {'Good': value, 'Bad': value}}}
-            woe_values (dict): Dictionary of WoE values for each bin of each column.
-                               Structure: {column: {bin: woe_value}}
+            counts (dict): Dictionary of bad/good counts for the bins of each column, as returned by obtain_counts. 
+                           Structure: {column: np.ndarray of shape (n_bins, 2)}
+            woe_values (dict): Dictionary of WoE values for the bins of each column.
+                               Structure: {column: np.ndarray of shape (n_bins,)}
 
         Returns:
             iv_values (dict): Dictionary with IV values for each column.
         """
-        iv_values = {}
-
-        # Loop through each column
-        for column, bins in counts.items():
-            iv = 0  # Initialize IV for the column
-
-            # Get total Good and Bad counts for the column
-            total_good = sum(bin_counts['Good'] for bin_counts in bins.values())
-            total_bad = sum(bin_counts['Bad'] for bin_counts in bins.values())
-
-            # Loop through each bin in the column
-            for bin_label, bin_counts in bins.items():
-                good = bin_counts['Good']
-                bad = bin_counts['Bad']
-
-                # Calculate percentages of good and bad for the bin
-                good_perc = good / total_good if total_good > 0 else 0
-                bad_perc = bad / total_bad if total_bad > 0 else 0
-
-                # Get WoE for the bin
-                woe = woe_values[column].get(bin_label, 0)
-
-                # Calculate IV contribution for the bin
-                iv += (good_perc - bad_perc) * woe
-
-            # Store IV for the column
-            iv_values[column] = iv
-
-        return iv_values
\ No newline at end of file
+        return WOE_Binner._compute_stats(counts, woe_values)[2]
@@ -0,0 +1,83 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+from sklearn.preprocessing import StandardScaler
+
+from scripts.feature_engineering import FeatureEngineering
+
+class TestExtractIds(unittest.TestCase):
+    '''
+    Tests that categorical ids are parsed the same way as string ids
+    '''
+    def test_categorical_ids(self):
+        ids = pd.Series(['x_1', 'x_2', 'x_2'], dtype='category')
+        self.assertEqual(FeatureEngineering.extract_ids(ids, prefix='x_').tolist(), [1, 2, 2])
+
+    def test_missing_categorical_ids_are_rejected(self):
+        ids = pd.Series(['x_1', 'x_2', None], dtype='category')
+        with self.assertRaises(ValueError):
+            FeatureEngineering.extract_ids(ids, prefix='x_')
+
+class TestExtractDateFeatures(unittest.TestCase):
+    '''
+    Tests the hour, day, month and year features obtained from the dates
+    '''
+    def test_missing_dates_give_missing_features(self):
+        data = pd.DataFrame({'TransactionStartTime': ['2018-11-15T02:18:49Z', None, '2019-02-13T10:01:28Z']})
+
+        features = FeatureEngineering.extract_date_features(data)[['Hour', 'Day', 'Month', 'Year']]
+
+        self.assertEqual(features.iloc[[0, 2]].astype(int).values.tolist(), [[2, 15, 11, 2018], [10, 13, 2, 2019]])
+        self.assertTrue(features.iloc[1].isna().all())
+
+class TestNormalizeNumericalFeatures(unittest.TestCase):
+    '''
+    Tests that the statistics of the normalization match the ones of the StandardScaler
+    '''
+    def test_missing_values_are_ignored(self):
+        data = pd.DataFrame({'a': [1.0, 2.0, np.nan, 4.0], 'b': [1.0, 2.0, 3.0, 4.0]})
+        expected = StandardScaler().fit(data[['a', 'b']])
+
+        normalized, scaler = FeatureEngineering.normalize_numerical_features(data.copy())
+
+        np.testing.assert_allclose(scaler.mean_, expected.mean_)
+        np.testing.assert_allclose(scaler.var_, expected.var_)
+        np.testing.assert_array_equal(scaler.n_samples_seen_, expected.n_samples_seen_)
+        np.testing.assert_allclose(normalized[['a', 'b']].to_numpy(), expected.transform(data[['a', 'b']]), rtol=1e-6)
+        self.assertEqual(normalized['a'].isna().sum(), 1)
+
+class TestSelectScalerColumns(unittest.TestCase):
+    '''
+    Tests that a scaler of some of the columns transforms them the same way as the scaler of all the columns
+    '''
+    def test_selected_columns_keep_their_statistics(self):
+        data = pd.DataFrame({'a': [1.0, 2.0, np.nan, 4.0], 'b': [5.0, 1.0, 2.0, 3.0], 'c': [0.0, 1.0, 1.0, 1.0]})
+        _, scaler = FeatureEngineering.normalize_numerical_features(data.copy())
+
+        selected = FeatureEngineering.select_scaler_columns(scaler, ['c', 'a'])
+
+        self.assertEqual(list(selected.feature_names_in_), ['c', 'a'])
+        np.testing.assert_allclose(selected.transform(data[['c', 'a']]), scaler.transform(data)[:, [2, 0]])
+
+class TestFitStreaming(unittest.TestCase):
+    '''
+    Tests that the statistics obtained chunk by chunk match the ones of the StandardScaler fitted on the whole data
+    '''
+    def test_missing_values_are_ignored(self):
+        data = pd.DataFrame({'a': [1.0, np.nan, 3.0, 4.0, np.nan, 6.0, 7.0], 'b': [1.0, 2.0, 3.0, 4.0, 5.0, 6.0, 7.0]})
+        expected = StandardScaler().fit(data)
+
+        chunks = (data.iloc[start:start + 3] for start in range(0, len(data), 3))
+        scaler, _ = FeatureEngineering.fit_streaming(chunks)
+
+        np.testing.assert_allclose(scaler.mean_, expected.mean_)
+        np.testing.assert_allclose(scaler.var_, expected.var_)
+        np.testing.assert_array_equal(scaler.n_samples_seen_, expected.n_samples_seen_)
+
+        transformed = FeatureEngineering.transform_numerical_features(data.copy(), scaler)
+        self.assertEqual(transformed['a'].isna().sum(), 2)
+        self.assertEqual(transformed['b'].isna().sum(), 0)
+
+if __name__ == '__main__':
+    unittest.main()